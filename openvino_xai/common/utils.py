@@ -5,6 +5,7 @@ Common functionality.
 """
 import logging
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Tuple
 from urllib.request import urlretrieve
@@ -39,6 +40,16 @@ def has_xai(model: ov.Model) -> bool:
     return False
 
 
+@lru_cache(maxsize=None)
+def get_ov_core() -> ov.Core:
+    """
+    Returns OpenVINO Core instance shared across XAI methods.
+
+    Creating Core loads device plugins, so the instance is created once and reused for all compilations.
+    """
+    return ov.Core()
+
+
 # Not a part of product
 def retrieve_otx_model(data_dir: str | Path, model_name: str, dir_url=None) -> None:
     destination_folder = Path(data_dir) / "otx_models"
@@ -64,12 +75,15 @@ def scaling(saliency_map: np.ndarray, cast_to_uint8: bool = True) -> np.ndarray:
         # If input map is 2D array, add dim so that below code would work
         saliency_map = saliency_map[np.newaxis, ...]
 
+    # Copy to float32 once, then scale in-place without float64 or temporary arrays
     saliency_map = saliency_map.astype(np.float32)
     num_maps, h, w = saliency_map.shape
     saliency_map = saliency_map.reshape((num_maps, h * w))
 
     min_values, max_values = get_min_max(saliency_map)
-    saliency_map = 255 * (saliency_map - min_values[:, None]) / (max_values - min_values + 1e-12)[:, None]
+    saliency_map -= min_values[:, None]
+    saliency_map *= np.float32(255)
+    saliency_map /= (max_values - min_values + np.float32(1e-12))[:, None]
     saliency_map = saliency_map.reshape(num_maps, h, w)
 
     if original_num_dims == 2:
@@ -72,6 +72,8 @@ class Explainer:
         self.explain_mode = explain_mode
 
         self.method = self.create_method(self.explain_mode, self.task)
+        # Explain mode is resolved once, the method does not change between calls
+        self._is_black_box = isinstance(self.method, BlackBoxXAIMethod)
 
     def create_method(self, explain_mode: ExplainMode, task: Task) -> MethodBase:
         if explain_mode == ExplainMode.WHITEBOX:
@@ -113,10 +115,7 @@ class Explainer:
     ) -> Explanation:
         """Explainer call that generates processed explanation result."""
         explain_target_indices = None
-        if (
-            isinstance(self.method, BlackBoxXAIMethod)
-            and explanation_parameters.target_explain_group == TargetExplainGroup.CUSTOM
-        ):
+        if self._is_black_box and explanation_parameters.target_explain_group == TargetExplainGroup.CUSTOM:
             explain_target_indices = get_explain_target_indices(
                 explanation_parameters.target_explain_labels,
                 explanation_parameters.label_names,
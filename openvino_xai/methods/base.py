@@ -8,7 +8,7 @@ import numpy as np
 import openvino.runtime as ov
 from openvino.runtime.utils.data_helpers.wrappers import OVDict
 
-from openvino_xai.common.utils import IdentityPreprocessFN
+from openvino_xai.common.utils import IdentityPreprocessFN, get_ov_core
 
 
 class MethodBase(ABC):
@@ -37,7 +37,8 @@ class MethodBase(ABC):
             raise RuntimeError("Model is not compiled. Call prepare_model() first.")
         if preprocess:
             x = self.preprocess_fn(x)
-        return self._model_compiled(x)
+        # Do not share input memory with the compiled model, otherwise it can be overwritten by other infer requests
+        return self._model_compiled(x, share_inputs=False)
 
     @abstractmethod
     def generate_saliency_map(self, data: np.ndarray) -> np.ndarray:
@@ -45,4 +46,4 @@ class MethodBase(ABC):
 
     def load_model(self) -> None:
         # TODO: support other devices?
-        self._model_compiled = ov.Core().compile_model(self._model, "CPU")
+        self._model_compiled = get_ov_core().compile_model(self._model, "CPU")
@@ -1,24 +1,28 @@
 # Copyright (C) 2023-2024 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import threading
 from typing import Callable, List, Tuple
 
 import cv2
 import numpy as np
 import openvino.runtime as ov
 from openvino.runtime.utils.data_helpers.wrappers import OVDict
-from tqdm import tqdm
 
-from openvino_xai.common.utils import IdentityPreprocessFN, scaling
+from openvino_xai.common.utils import IdentityPreprocessFN, get_ov_core, scaling
 from openvino_xai.methods.black_box.base import BlackBoxXAIMethod
 
+# Number of masks generated and inferred at once
+MASK_BATCH_SIZE = 32
+
 
 class RISE(BlackBoxXAIMethod):
     """RISE explains classification models in black-box mode using RISE (https://arxiv.org/abs/1806.07421).
 
     :param model: OpenVINO model.
     :type model: ov.Model
-    :param postprocess_fn: Preprocessing function that extract scores from IR model output.
+    :param postprocess_fn: Postprocessing function that extract scores from IR model output.
+        It is called for a single input at a time and should return scores of shape (1, num_classes).
     :type postprocess_fn: Callable[[OVDict], np.ndarray]
     :param preprocess_fn: Preprocessing function, identity function by default
         (assume input images are already preprocessed by user).
@@ -41,10 +45,15 @@ class RISE(BlackBoxXAIMethod):
             self.prepare_model()
 
     def prepare_model(self, load_model: bool = True) -> ov.Model:
+        self._model = self._get_dynamic_batch_model(self._model)
         if load_model:
             self.load_model()
         return self._model
 
+    def load_model(self) -> None:
+        # Masked inputs are independent, compile for throughput to run them in parallel infer requests
+        self._model_compiled = get_ov_core().compile_model(self._model, "CPU", {"PERFORMANCE_HINT": "THROUGHPUT"})
+
     def generate_saliency_map(
         self,
         data: np.ndarray,
@@ -77,7 +86,7 @@ class RISE(BlackBoxXAIMethod):
         """
         data_preprocessed = self.preprocess_fn(data)
 
-        saliency_maps = self._run_synchronous_explanation(
+        saliency_maps = self._run_asynchronous_explanation(
             data_preprocessed,
             explain_target_indices,
             num_masks,
@@ -91,7 +100,7 @@ class RISE(BlackBoxXAIMethod):
         saliency_maps = np.expand_dims(saliency_maps, axis=0)
         return saliency_maps
 
-    def _run_synchronous_explanation(
+    def _run_asynchronous_explanation(
         self,
         data_preprocessed: np.ndarray,
         target_classes: List[int] | None,
@@ -100,6 +109,9 @@ class RISE(BlackBoxXAIMethod):
         prob: float,
         seed: int,
     ) -> np.ndarray:
+        # Progress bar is only needed by RISE, do not load it on library import
+        from tqdm import tqdm
+
         _, _, height, width = data_preprocessed.shape
         input_size = height, width
 
@@ -109,63 +121,139 @@ class RISE(BlackBoxXAIMethod):
 
         if target_classes is None:
             num_targets = num_classes
+            target_indices = None
         else:
             num_targets = len(target_classes)
+            # Convert once, indices are used to gather scores for every inferred batch
+            target_indices = np.asarray(target_classes, dtype=np.int64)
 
         rand_generator = np.random.default_rng(seed=seed)
 
-        sal_maps = np.zeros((num_targets, input_size[0], input_size[1]))
-        for _ in tqdm(range(0, num_masks), desc="Explaining in synchronous mode"):
-            mask = self._generate_mask(input_size, num_cells, prob, rand_generator)
-            # Add channel dimensions for masks
-            masked = mask * data_preprocessed
+        # Scored masks of all batches are summed in-place into a single float32 buffer
+        sal_maps = np.zeros((num_targets, input_size[0], input_size[1]), dtype=np.float32)
+        sal_maps_lock = threading.Lock()
+
+        def accumulate_scored_masks(request: ov.InferRequest, masks: np.ndarray) -> None:
+            raw_scores = self._postprocess_per_sample(request.results, len(masks))
+            sal = self._get_scored_mask(raw_scores, masks, target_indices)
+            # Callbacks are executed in parallel by OpenVINO threads
+            with sal_maps_lock:
+                np.add(sal_maps, sal, out=sal_maps)
 
-            forward_output = self.model_forward(masked, preprocess=False)
-            raw_scores = self.postprocess_fn(forward_output)
+        # Number of parallel infer requests is defined by the compiled model (optimal number by default)
+        infer_queue = ov.AsyncInferQueue(self._model_compiled)
+        infer_queue.set_callback(accumulate_scored_masks)
 
-            sal = self._get_scored_mask(raw_scores, mask, target_classes)
-            sal_maps += sal
+        # Masks are inferred in batches if the model supports dynamic batch, otherwise one by one
+        infer_batch_size = MASK_BATCH_SIZE if self._has_dynamic_batch(self._model) else 1
+        # Masks are float32, do not up-cast masked inputs to float64 (e.g. after mean/std normalization)
+        data_preprocessed = data_preprocessed.astype(np.float32, copy=False)
 
-        if target_classes is not None:
-            sal_maps = self._reconstruct_sparce_saliency_map(sal_maps, num_classes, input_size, target_classes)
+        for batch_start in tqdm(range(0, num_masks, MASK_BATCH_SIZE), desc="Explaining in asynchronous mode"):
+            batch_size = min(MASK_BATCH_SIZE, num_masks - batch_start)
+            masks = self._generate_masks(batch_size, input_size, num_cells, prob, rand_generator)
+            for infer_batch_start in range(0, batch_size, infer_batch_size):
+                masks_batch = masks[infer_batch_start : infer_batch_start + infer_batch_size]
+                # Add channel dimensions for masks: (B, 1, H, W) * (1, C, H, W) -> (B, C, H, W)
+                masked = masks_batch[:, None] * data_preprocessed
+                infer_queue.start_async(masked, userdata=masks_batch)
+        infer_queue.wait_all()
+
+        if target_indices is not None:
+            sal_maps = self._reconstruct_sparce_saliency_map(sal_maps, num_classes, input_size, target_indices)
         return sal_maps
 
     @staticmethod
-    def _get_scored_mask(raw_scores: np.ndarray, mask: np.ndarray, target_classes: List[int] | None) -> np.ndarray:
-        if target_classes:
-            return np.take(raw_scores, target_classes).reshape(-1, 1, 1) * mask
-        else:
-            return raw_scores.reshape(-1, 1, 1) * mask
+    def _get_dynamic_batch_model(model: ov.Model) -> ov.Model:
+        """Returns a copy of the model with dynamic batch dimension, or the original model if it is not feasible."""
+        input_shape = model.input(0).partial_shape
+        if len(model.inputs) != 1 or not RISE._has_batch_dimension(input_shape) or input_shape[0].is_dynamic:
+            return model
+        model_dynamic = model.clone()
+        partial_shape = model_dynamic.input(0).partial_shape
+        partial_shape[0] = -1  # make batch dimensions to be dynamic
+        try:
+            model_dynamic.reshape(partial_shape)
+        except RuntimeError:
+            return model
+        if not RISE._has_dynamic_batch(model_dynamic):
+            return model
+        return model_dynamic
+
+    @staticmethod
+    def _has_dynamic_batch(model: ov.Model) -> bool:
+        for port in [*model.inputs, *model.outputs]:
+            partial_shape = port.partial_shape
+            # Scalar or dynamic-rank ports have no batch dimension to infer masks in batches
+            if not RISE._has_batch_dimension(partial_shape) or not partial_shape[0].is_dynamic:
+                return False
+        return True
+
+    @staticmethod
+    def _has_batch_dimension(partial_shape: ov.PartialShape) -> bool:
+        return partial_shape.rank.is_static and len(partial_shape) > 0
+
+    def _postprocess_per_sample(self, results: dict, batch_size: int) -> np.ndarray:
+        """Applies postprocess_fn, defined for a single input, to every sample of the batched model outputs."""
+        if batch_size == 1:
+            return self.postprocess_fn(OVDict(results))
+        return np.concatenate(
+            [
+                self.postprocess_fn(OVDict({port: output[i : i + 1] for port, output in results.items()}))
+                for i in range(batch_size)
+            ]
+        )
+
+    @staticmethod
+    def _get_scored_mask(raw_scores: np.ndarray, masks: np.ndarray, target_indices: np.ndarray | None) -> np.ndarray:
+        """Returns the sum of masks weighted by scores, raw_scores have (B, num_classes) and masks (B, H, W) shape."""
+        if raw_scores.ndim != 2 or raw_scores.shape[0] != masks.shape[0]:
+            raise ValueError(
+                f"Expected scores of shape ({masks.shape[0]}, num_classes) for {masks.shape[0]} masked inputs, "
+                f"but got {raw_scores.shape}. Make sure that postprocess_fn returns scores of shape (1, num_classes)."
+            )
+        if target_indices is not None:
+            raw_scores = raw_scores[:, target_indices]
+        # (C, B) @ (B, H * W) is computed by BLAS in a single call
+        num_masks, height, width = masks.shape
+        scored_masks = raw_scores.T @ masks.reshape(num_masks, height * width)
+        return scored_masks.reshape(-1, height, width)
 
     @staticmethod
     def _reconstruct_sparce_saliency_map(
-        sal_maps: np.ndarray, num_classes: int, input_size, target_classes: List[int] | None
+        sal_maps: np.ndarray, num_classes: int, input_size, target_indices: np.ndarray
     ) -> np.ndarray:
-        # TODO: see if np.put() or other alternatives works faster (requires flatten array)
         sal_maps_tmp = sal_maps
-        sal_maps = np.zeros((num_classes, input_size[0], input_size[1]))
-        for i, sal in enumerate(sal_maps_tmp):
-            sal_maps[target_classes[i]] = sal
+        sal_maps = np.zeros((num_classes, input_size[0], input_size[1]), dtype=sal_maps_tmp.dtype)
+        sal_maps[target_indices] = sal_maps_tmp
         return sal_maps
 
     @staticmethod
-    def _generate_mask(input_size: Tuple[int, int], num_cells: int, prob: float, rand_generator) -> np.ndarray:
-        """Generate masks for RISE
+    def _generate_masks(
+        num_masks: int, input_size: Tuple[int, int], num_cells: int, prob: float, rand_generator
+    ) -> np.ndarray:
+        """Generate a batch of masks for RISE
         Returns:
-            mask (np.array): float mask from 0 to 1 with size of model input
+            masks (np.array): float masks from 0 to 1 with size of (num_masks, *input_size)
         """
         cell_size = np.ceil(np.array(input_size) / num_cells)
         up_size = np.array((num_cells + 1) * cell_size, dtype=np.uint32)
 
-        grid_size = (num_cells, num_cells)
-        grid = rand_generator.random(grid_size) < prob
-        grid = grid.astype(np.float32)
+        grid_size = (num_cells, num_cells, num_masks)
+        grids = rand_generator.random(grid_size) < prob
+        grids = grids.astype(np.float32)
 
         # Random shifts
-        x = rand_generator.integers(0, cell_size[0])
-        y = rand_generator.integers(0, cell_size[1])
-        # Linear up-sampling and cropping
-        upsampled_mask = cv2.resize(grid, up_size, interpolation=cv2.INTER_CUBIC)
-        mask = upsampled_mask[x : x + input_size[0], y : y + input_size[1]]
-        mask = np.clip(mask, 0, 1)
-        return mask
+        x = rand_generator.integers(0, cell_size[0], size=num_masks)
+        y = rand_generator.integers(0, cell_size[1], size=num_masks)
+        # Linear up-sampling of contiguous low-res grids one by one (cheap for tiny grids) and cropping by slicing,
+        # which avoids both cv2.resize channel limits and a strided gather over the whole batch
+        grids = np.ascontiguousarray(grids.transpose((2, 0, 1)))
+        dsize = int(up_size[1]), int(up_size[0])
+        masks = np.empty((num_masks, *input_size), dtype=np.float32)
+        for i in range(num_masks):
+            upsampled_mask = cv2.resize(grids[i], dsize, interpolation=cv2.INTER_LINEAR)
+            # Linear interpolation of the binary grid stays in [0, 1], no need to clip
+            # (clipping is required for interpolations that can overshoot, e.g. cv2.INTER_CUBIC)
+            masks[i] = upsampled_mask[x[i] : x[i] + input_size[0], y[i] : y[i] + input_size[1]]
+        return masks
@@ -6,6 +6,7 @@ from typing import Callable, List, Tuple
 import numpy as np
 import openvino.runtime as ov
 from openvino.runtime import opset10 as opset
+from openvino.runtime import opset11
 
 from openvino_xai.common.utils import IdentityPreprocessFN
 from openvino_xai.methods.white_box.base import WhiteBoxMethod
@@ -87,15 +88,18 @@ class DetClassProbabilityMap(WhiteBoxMethod):
                 cls_head_output_nodes[scale_idx] = cls_scores_out
 
         # Handle scales
+        # Interpolate-11 takes integer sizes of the spatial axes only, no need for the dummy scales input
+        saliency_map_size = np.array(self._saliency_map_size, dtype=np.int64)
         for scale_idx in range(len(cls_head_output_nodes)):
-            cls_head_output_nodes[scale_idx] = opset.interpolate(
+            cls_head_output_nodes[scale_idx] = opset11.interpolate(
                 cls_head_output_nodes[scale_idx].output(0),
-                output_shape=np.array([1, num_cls_out_channels, *self._saliency_map_size]),
-                scales=np.array([1, 1, 1, 1], dtype=np.float32),
+                scales_or_sizes=saliency_map_size,
                 mode="linear",
                 shape_calculation_mode="sizes",
+                axes=np.array([2, 3], dtype=np.int64),
             )
 
+        # Softmax is applied once, after averaging over scales
         saliency_maps = opset.reduce_mean(opset.concat(cls_head_output_nodes, 0), 0, keep_dims=True)
         saliency_maps = opset.softmax(saliency_maps.output(0), 1)
 
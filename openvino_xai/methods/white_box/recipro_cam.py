@@ -43,6 +43,8 @@ class FeatureMapPerturbationBase(WhiteBoxMethod):
 
     def generate_xai_branch(self) -> ov.Node:
         """Implements FeatureMapPerturbation-based XAI method."""
+        # Fresh clone on every call: the clone head is rewired to the original model's target node,
+        # so reusing a clone would rewire the original model on the next call
         model_clone = self._model_ori.clone()
         self._propagate_dynamic_batch_dimension(model_clone)
 
@@ -107,16 +109,11 @@ class ReciproCAM(FeatureMapPerturbationBase):
         if not self._is_valid_layout(c, h, w):
             raise ValueError(f"ReciproCAM supports only NCHW layout, but got NHWC, with shape: [N, {c}, {h}, {w}]")
 
-        feature_map_repeated = opset.tile(target_node_ori.output(0), (h * w, 1, 1, 1))
-        mosaic_feature_map_mask = np.zeros((h * w, c, h, w), dtype=np.float32)
-        tmp = np.arange(h * w)
-        spacial_order = np.reshape(tmp, (h, w))
-        for i in range(h):
-            for j in range(w):
-                k = spacial_order[i, j]
-                mosaic_feature_map_mask[k, :, i, j] = np.ones((c))
+        # k-th mask keeps only k-th spatial location
+        mosaic_feature_map_mask = np.eye(h * w, dtype=np.float32).reshape((h * w, 1, h, w))
         mosaic_feature_map_mask = opset.constant(mosaic_feature_map_mask)
-        mosaic_feature_map = opset.multiply(feature_map_repeated, mosaic_feature_map_mask)
+        # (1, c, h, w) * (h * w, 1, h, w) -> (h * w, c, h, w), no need to tile the feature map
+        mosaic_feature_map = opset.multiply(target_node_ori.output(0), mosaic_feature_map_mask)
 
         for node in post_target_node_clone:
             node.input(0).replace_source_output(mosaic_feature_map.output(0))
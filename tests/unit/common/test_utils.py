@@ -7,7 +7,7 @@ import openvino.runtime as ov
 
 from openvino_xai.api.api import insert_xai
 from openvino_xai.common.parameters import Task
-from openvino_xai.common.utils import has_xai, retrieve_otx_model
+from openvino_xai.common.utils import get_ov_core, has_xai, retrieve_otx_model
 from tests.integration.test_classification import DEFAULT_CLS_MODEL
 
 DARA_DIR = Path(".data")
@@ -27,3 +27,10 @@ def test_has_xai():
     )
 
     assert has_xai(model_xai)
+
+
+def test_get_ov_core():
+    core = get_ov_core()
+
+    assert isinstance(core, ov.Core)
+    assert get_ov_core() is core
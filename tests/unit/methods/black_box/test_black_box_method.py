@@ -7,13 +7,28 @@ import cv2
 import numpy as np
 import openvino.runtime as ov
 import pytest
+from openvino.runtime import opset10 as opset
 
 from openvino_xai.common.utils import retrieve_otx_model
-from openvino_xai.explainer.utils import get_postprocess_fn, get_preprocess_fn
-from openvino_xai.methods.black_box.rise import RISE
+from openvino_xai.explainer.utils import get_postprocess_fn, get_preprocess_fn, softmax
+from openvino_xai.methods.black_box.rise import MASK_BATCH_SIZE, RISE
 from tests.integration.test_classification import DEFAULT_CLS_MODEL
 
 
+def build_cls_model(num_classes: int = 5, input_size: int = 16, scalar_output: bool = False) -> ov.Model:
+    """Builds a tiny classification model with static batch, optionally with an auxiliary scalar output."""
+    rand_generator = np.random.default_rng(seed=0)
+    data = opset.parameter([1, 3, input_size, input_size], np.float32, name="data")
+    pooled = opset.reduce_mean(data, [2, 3])
+    weights = opset.constant(rand_generator.standard_normal((3, num_classes)).astype(np.float32))
+    logits = opset.matmul(pooled, weights, False, False)
+    logits.output(0).get_tensor().set_names({"logits"})
+    outputs = [logits]
+    if scalar_output:
+        outputs.append(opset.reduce_mean(data, [0, 1, 2, 3]))
+    return ov.Model(outputs, [data])
+
+
 class TestRISE:
     image = cv2.imread("tests/assets/cheetah_person.jpg")
     data_dir = Path(".data")
@@ -40,3 +55,87 @@ class TestRISE:
         assert saliency_map.dtype == np.uint8
         assert saliency_map.shape == (1, 20, 224, 224)
         assert (saliency_map >= 0).all() and (saliency_map <= 255).all()
+
+    @pytest.mark.parametrize("input_size", [(224, 224), (200, 240)])
+    def test_generate_masks(self, input_size):
+        rand_generator = np.random.default_rng(seed=0)
+        masks = RISE._generate_masks(10, input_size, num_cells=8, prob=0.5, rand_generator=rand_generator)
+
+        assert masks.shape == (10, *input_size)
+        assert masks.dtype == np.float32
+        assert (masks >= 0).all() and (masks <= 1).all()
+        assert not np.array_equal(masks[0], masks[1])
+
+    def test_dynamic_batch(self):
+        model = build_cls_model()
+        data = np.random.default_rng(seed=0).random((1, 3, 16, 16)).astype(np.float32)
+
+        batch_sizes = []
+
+        class RISEBatchSizes(RISE):
+            def _postprocess_per_sample(self, results, batch_size):
+                batch_sizes.append(batch_size)
+                return super()._postprocess_per_sample(results, batch_size)
+
+        rise_method = RISEBatchSizes(model, self.postprocess_fn)
+        rise_method.generate_saliency_map(data, num_masks=MASK_BATCH_SIZE + 8)
+
+        # Masks are inferred in batches via a copy of the model with dynamic batch, original model is untouched
+        assert rise_method.model_compiled.input(0).partial_shape[0].is_dynamic
+        assert not model.input(0).partial_shape[0].is_dynamic
+        assert sorted(batch_sizes) == [8, MASK_BATCH_SIZE]
+
+    def test_scalar_output(self):
+        model = build_cls_model(scalar_output=True)
+        data = np.random.default_rng(seed=0).random((1, 3, 16, 16)).astype(np.float32)
+
+        rise_method = RISE(model, self.postprocess_fn)
+        saliency_map = rise_method.generate_saliency_map(data, num_masks=10)
+
+        # Scalar output has no batch dimension, masks are inferred one by one
+        assert not RISE._has_dynamic_batch(rise_method._model)
+        assert saliency_map.shape == (1, 5, 16, 16)
+
+    def test_postprocess_fn_per_sample(self):
+        model = build_cls_model()
+        data = np.random.default_rng(seed=0).random((1, 3, 16, 16)).astype(np.float32)
+
+        def postprocess_fn_rowwise(x):
+            logits = x["logits"]
+            scores = np.exp(logits - logits.max(axis=1, keepdims=True))
+            return scores / scores.sum(axis=1, keepdims=True)
+
+        saliency_maps = []
+        for postprocess_fn in [postprocess_fn_rowwise, lambda x: softmax(x["logits"])]:
+            rise_method = RISE(model, postprocess_fn)
+            saliency_maps.append(rise_method.generate_saliency_map(data, num_masks=100, scale_output=False))
+
+        # postprocess_fn is applied to each masked input separately, even if masks are inferred in batches
+        assert np.allclose(saliency_maps[0], saliency_maps[1], rtol=1e-5)
+
+        # Batch-1 style postprocess_fn
+        rise_method = RISE(model, lambda x: x["logits"][0][None])
+        saliency_map = rise_method.generate_saliency_map(data, num_masks=100)
+        assert saliency_map.shape == (1, 5, 16, 16)
+
+    def test_get_scored_mask_shape_mismatch(self):
+        masks = np.zeros((4, 16, 16), dtype=np.uint8)
+        with pytest.raises(ValueError):
+            RISE._get_scored_mask(np.zeros((1, 5), dtype=np.float32), masks, None)
+
+    def test_preprocess_fn_called_once(self):
+        model = build_cls_model(input_size=16)
+        preprocess_fn_model = get_preprocess_fn(change_channel_order=True, input_size=(16, 16), hwc_to_chw=True)
+
+        num_calls = 0
+
+        def preprocess_fn(x):
+            nonlocal num_calls
+            num_calls += 1
+            return preprocess_fn_model(x)
+
+        rise_method = RISE(model, self.postprocess_fn, preprocess_fn)
+        rise_method.generate_saliency_map(self.image, num_masks=5)
+
+        # Masks are applied to the preprocessed input, which is not preprocessed again per mask
+        assert num_calls == 1
@@ -6,6 +6,7 @@ from pathlib import Path
 import numpy as np
 import openvino.runtime as ov
 import pytest
+from openvino.runtime import opset10 as opset
 
 from openvino_xai.common.utils import retrieve_otx_model
 from openvino_xai.methods.white_box.activation_map import ActivationMap
@@ -17,6 +18,21 @@ from tests.integration.test_classification import DEFAULT_CLS_MODEL
 from tests.integration.test_detection import DEFAULT_DET_MODEL
 
 
+def build_cnn_model(num_classes: int = 5, num_channels: int = 32) -> ov.Model:
+    """Builds a tiny CNN classification model with a (1, num_channels, 7, 7) backbone output."""
+    rand_generator = np.random.default_rng(seed=0)
+    data = opset.parameter([1, 3, 56, 56], np.float32, name="data")
+    weights = opset.constant(rand_generator.standard_normal((num_channels, 3, 8, 8)).astype(np.float32) * 0.1)
+    backbone = opset.relu(opset.convolution(data, weights, [8, 8], [0, 0], [0, 0], [1, 1]))
+    backbone.set_friendly_name("backbone")
+    pooling = opset.avg_pool(backbone, [1, 1], [0, 0], [0, 0], [7, 7], True)
+    pooling.set_friendly_name("GlobalPool")
+    features = opset.reshape(pooling, opset.constant(np.array([0, -1], dtype=np.int64)), True)
+    fc_weights = opset.constant(rand_generator.standard_normal((num_channels, num_classes)).astype(np.float32))
+    logits = opset.matmul(features, fc_weights, False, False)
+    return ov.Model([opset.softmax(logits, 1)], [data])
+
+
 class TestActivationMap:
     """Test for ActivationMap."""
 
@@ -131,7 +147,31 @@ class TestReciproCAM:
 
         # Check that node was inserted in the right place
         nodes_list = [op.get_friendly_name() for op in model_xai.get_ordered_ops()]
-        assert nodes_list.index(xai_node_name) == 567
+        assert nodes_list.index(xai_node_name) == 565
+
+        # Feature map is broadcasted over the spatial masks, not tiled
+        assert "Tile" not in {op.get_type_name() for op in model_xai.get_ordered_ops()}
+
+
+@pytest.mark.parametrize("target_layer", [None, "backbone"])
+def test_reciprocam_generate_xai_branch_twice(target_layer):
+    """Test that generating ReciproCAM XAI branch twice does not modify the original model."""
+    model = build_cnn_model()
+    data = np.random.default_rng(seed=0).random((1, 3, 56, 56)).astype(np.float32)
+    ref_logits = ov.Core().compile_model(model, "CPU")(data)[0]
+
+    reciprocam_xai_method = ReciproCAM(model, target_layer, prepare_model=False)
+    saliency_maps = []
+    for _ in range(2):
+        xai_output_node = reciprocam_xai_method.generate_xai_branch()
+        model_xai = ov.Model([*model.outputs, xai_output_node.output(0)], model.get_parameters())
+        result = ov.Core().compile_model(model_xai, "CPU")(data)
+        assert np.allclose(result[0], ref_logits, atol=1e-6)
+        saliency_maps.append(result[-1])
+
+    assert np.array_equal(saliency_maps[0], saliency_maps[1])
+    logits = ov.Core().compile_model(model, "CPU")(data)[0]
+    assert np.allclose(logits, ref_logits, atol=1e-6)
 
 
 class TestViTReciproCAM: